@@ -1,12 +1,14 @@
 #!/usr/bin/env python
 
 from .crypto import Crypto
-from .datatypes import EncryptedFile, FileFragment
+from .datatypes import EncryptedFile, FileFragment, FragmentPolicy, FragmentTier
 from .redis_service import RedisService
 
 __all__ = [
     "Crypto",
     "EncryptedFile",
     "FileFragment",
+    "FragmentPolicy",
+    "FragmentTier",
     "RedisService",
 ]
@@ -9,6 +9,9 @@ as well as fragment and defragment the encrypted data. The encrypted files are a
 with a user ID and stored as a list of FileFragment objects. Each fragment contains
 the fragment's index and data. The module also provides a method to generate a unique
 identifier for each file.
+
+The fragment size is chosen per file from a FragmentPolicy: small files are kept as a
+single inlined fragment, and bigger files use fewer, larger fragments as they grow.
 """
 
 import uuid
@@ -16,11 +19,9 @@ from datetime import UTC, datetime
 
 from cryptography.fernet import Fernet
 
-from .datatypes import EncryptedFile, FileFragment
+from .datatypes import EncryptedFile, FileFragment, FragmentPolicy
 
 class Crypto:
-    _FRAGMENT_SIZE = 1024 * 1024 # 1MB
-
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -33,10 +34,14 @@ class Crypto:
 
         return cls._instance
 
-    def __init__(self, key: bytes):
+    def __init__(self, key: bytes, policy: FragmentPolicy | None = None):
         self.__key = key
         self.__cipher = Fernet(self.__key)
 
+        # The instance is shared, so only replace the policy when one is explicitly given
+        if policy is not None or not hasattr(self, "_policy"):
+            self._policy = policy or FragmentPolicy()
+
     def _reinit_if_key_changes(self, key: bytes) -> None:
         """
         Reinitialize the cipher if the key changes.
@@ -48,25 +53,61 @@ class Crypto:
             self.__key = key
             self.__cipher = Fernet(self.__key)
 
-    def _fragment_bytes(self, token: bytes) -> list[FileFragment]:
+    def _is_inline(self, token_size: int) -> bool:
+        """
+        Check whether a token is small enough to be inlined into the file metadata.
+
+        Args:
+            token_size (int): The size (in bytes) of the encrypted token.
+
+        Returns:
+            bool: True if the token must be stored as a single inlined fragment.
+        """
+        return token_size <= self._policy.inline_threshold
+
+    def _select_fragment_size(self, token_size: int) -> int:
+        """
+        Choose the fragment size for a token according to the fragmentation policy.
+        Inlined tokens use their own size, so they are kept as a single fragment.
+
+        Args:
+            token_size (int): The size (in bytes) of the encrypted token.
+
+        Returns:
+            int: The fragment size (in bytes).
+        """
+        if self._is_inline(token_size):
+            return max(token_size, 1)
+
+        tiers = self._policy.tiers
+        tier = next((t for t in tiers if token_size <= t.max_token_size), tiers[-1])
+
+        return tier.fragment_size
+
+    def _fragment_bytes(self, token: bytes, fragment_size: int | None = None) -> list[FileFragment]:
         """
         Fragment a tokenized (encrypted) file into smaller chunks. Each chunk is represented as a dictionary.
 
         Args:
             token (bytes): The file encrypted using Fernet's token format.
+            fragment_size (int | None): The fragment size (in bytes). If not given, it is chosen
+                                        from the fragmentation policy.
 
         Returns:
             list[FileFragment]: A list of file fragments.
                                 To see FileFragment attributes refer to `datatypes` module documentation.
         """
+        if fragment_size is None:
+            fragment_size = self._select_fragment_size(len(token))
+
         fragments = []
         fragment_uuid = str(uuid.uuid4())
 
-        for idx in range(0, len(token), self._FRAGMENT_SIZE):
+        for idx in range(0, len(token), fragment_size):
             frag = FileFragment(
                 uuid=fragment_uuid,
-                data=token[idx:idx+self._FRAGMENT_SIZE],
-                index=(idx // self._FRAGMENT_SIZE)
+                data=token[idx:idx+fragment_size],
+                index=(idx // fragment_size)
             )
             fragments.append(frag)
 
@@ -74,7 +115,8 @@ class Crypto:
 
     def encrypt(self, file_data: bytes, user_id: str, key: bytes) -> EncryptedFile:
         """
-        Encrypt a file and associate it with the user's ID. The file is fragmented into smaller chunks.
+        Encrypt a file and associate it with the user's ID. The file is fragmented into smaller chunks
+        whose size is chosen from the fragmentation policy, or inlined if it is small enough.
 
         Args:
             file_data (bytes): The file data to be encrypted.
@@ -88,7 +130,8 @@ class Crypto:
         self._reinit_if_key_changes(key)
 
         token = self.__cipher.encrypt(file_data)  # Encrypt the file data as a Fermet's token format
-        fragments = self._fragment_bytes(token)
+        fragment_size = self._select_fragment_size(len(token))
+        fragments = self._fragment_bytes(token, fragment_size)
         file_uuid = str(uuid.uuid4())
 
         encrypted_file = EncryptedFile(
@@ -96,7 +139,9 @@ class Crypto:
             user_id=user_id,
             key=self.__key,
             created_at=str(int(datetime.now(UTC).timestamp())),
-            fragments=fragments
+            fragments=fragments,
+            fragment_size=fragment_size,
+            inline=self._is_inline(len(token)),
         )
 
         return encrypted_file
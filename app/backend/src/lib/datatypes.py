@@ -6,10 +6,11 @@ Datatypes Module
 
 This module defines the data structures used in the application.
 It includes the FileFragment and EncryptedFile classes, which represent
-fragments of files and encrypted files, respectively
+fragments of files and encrypted files, respectively, and the FragmentTier
+and FragmentPolicy classes, which describe how files are fragmented.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class FileFragment:
@@ -36,12 +37,73 @@ class EncryptedFile:
         key (str): The key used to encrypt the file.
         created_at (str): The timestamp when the file was created.
         fragments (list[FileFragment]): A list of fragments of the encrypted file.
+        fragment_size (int): The fragment size (in bytes) chosen for the file.
+        inline (bool): Whether the file is small enough to be stored inside its metadata.
     """
     uuid: str
     user_id: str
     key: bytes
     created_at: str
     fragments: list[FileFragment]
+    fragment_size: int = 0
+    inline: bool = False
+
+@dataclass(frozen=True)
+class FragmentTier:
+    """
+    Represents a size tier of the fragmentation policy.
+
+    Attributes:
+        max_token_size (int): The largest encrypted token size (in bytes) covered by the tier.
+        fragment_size (int): The fragment size (in bytes) used for tokens within the tier.
+    """
+    max_token_size: int
+    fragment_size: int
+
+    def __post_init__(self):
+        if self.max_token_size <= 0:
+            raise ValueError("Tier max_token_size must be greater than 0")
+
+        if self.fragment_size <= 0:
+            raise ValueError("Tier fragment_size must be greater than 0")
+
+@dataclass(frozen=True)
+class FragmentPolicy:
+    """
+    Represents the policy used to choose the fragment size of each file.
+
+    Attributes:
+        inline_threshold (int): Tokens up to this size (in bytes) are kept as a single inlined fragment.
+        tiers (tuple[FragmentTier, ...]): Size tiers, sorted by `max_token_size` on creation. Tokens
+                                          bigger than the last tier use the last tier's fragment size.
+        max_fragment_size (int): The largest fragment size (in bytes) accepted by the storage backend.
+    """
+    # Defaults are chosen from the results in tests/benchmarks/README.md
+    inline_threshold: int = 256 * 1024                      # 256KB
+    tiers: tuple[FragmentTier, ...] = field(default_factory=lambda: (
+        FragmentTier(max_token_size=1024 * 1024, fragment_size=256 * 1024),                 # <= 1MB: 256KB
+        FragmentTier(max_token_size=512 * 1024 * 1024, fragment_size=1024 * 1024),          # <= 512MB: 1MB
+        FragmentTier(max_token_size=16 * 1024 * 1024 * 1024, fragment_size=4 * 1024 * 1024),  # <= 16GB: 4MB
+    ))
+    max_fragment_size: int = 512 * 1024 * 1024              # Redis string limit (proto-max-bulk-len)
+
+    def __post_init__(self):
+        if self.inline_threshold < 0:
+            raise ValueError("Policy inline_threshold must not be negative")
+
+        if self.max_fragment_size <= 0:
+            raise ValueError("Policy max_fragment_size must be greater than 0")
+
+        if self.inline_threshold > self.max_fragment_size:
+            raise ValueError("Policy inline_threshold must not exceed max_fragment_size")
+
+        if not self.tiers:
+            raise ValueError("Policy must have at least one tier")
+
+        if any(t.fragment_size > self.max_fragment_size for t in self.tiers):
+            raise ValueError("Tier fragment_size must not exceed the policy max_fragment_size")
+
+        object.__setattr__(self, "tiers", tuple(sorted(self.tiers, key=lambda t: t.max_token_size)))
 
 @dataclass
 class EncryptedResponse:
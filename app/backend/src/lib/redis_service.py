@@ -9,7 +9,8 @@ This module provides a RedisService class that allows you to store and retrieve
 file metadata and fragments in a Redis database. The metadata includes the file's
 unique identifier, user ID, encryption key, and creation timestamp. The fragments
 are stored as a list of FileFragment objects, which contain the fragment's index
-and data.
+and data. Small files are inlined into the metadata hash, so they are stored and
+retrieved without any extra fragment keys.
 
 Usage:
 
@@ -23,13 +24,24 @@ Usage:
         file_uuid="1234",
         user_id="user1",
         key="encryption_key",
-        created_at="2023-10-01T12:00:00Z"
+        created_at="2023-10-01T12:00:00Z",
+        fragment_size=1048576
     )
 
 >>> # Store fragments
 >>> fragments = [FileFragment(index=0, data=b"fragment_data_0"), FileFragment(index=1, data=b"fragment_data_1")]
 >>> redis_service.store_fragments(file_uuid="1234", fragments=fragments)
 
+>>> # Store an inlined (single fragment) file along with its metadata
+>>> redis_service.store_metadata(
+        file_uuid="5678",
+        user_id="user1",
+        key="encryption_key",
+        created_at="2023-10-01T12:00:00Z",
+        fragment_size=15,
+        inline_data=b"fragment_data_0"
+    )
+
 >>> # Retrieve metadata
 >>> metadata = redis_service.get_metadata(file_uuid="1234")
 
@@ -42,59 +54,88 @@ import redis
 from .datatypes import FileFragment
 
 class RedisService:
+    _METADATA_FIELDS = ("user_id", "key", "created_at", "fragment_size")
+
+    _BATCH_SIZE = 4 * 1024 * 1024               # 4MB of fragments sent per pipeline or requested per MGET
+    _LEGACY_FRAGMENT_SIZE = 1024 * 1024         # 1MB, for files stored without a fragment size
+
     def __init__(self, url):
         self._redis = redis.Redis.from_url(url)
 
-    def store_metadata(self, file_uuid: str, user_id: str, key: str, created_at: str) -> None:
+    def store_metadata(self, file_uuid: str, user_id: str, key: str, created_at: str, fragment_size: int = 0,
+                       inline_data: bytes | None = None) -> None:
         """
-        Save metadata of an encrypted file into Redis database.
+        Save metadata of an encrypted file into Redis database. Inlined files are saved
+        along with their metadata in a single HSET, so they need no fragment keys.
 
         Args:
             file_uuid (str): File's unique identifier
             user_id (str): User's unique identifier
             key (str): Encryption key
             created_at (str): Timestamp of when the file was created
+            fragment_size (int): Fragment size (in bytes) chosen for the file
+            inline_data (bytes | None): Data of the file's single fragment, if it is inlined
         """
-        self._redis.hset(f"file:{file_uuid}", mapping={
+        mapping = {
             "user_id": user_id,
             "key": key,
-            "created_at": created_at
-        })
+            "created_at": created_at,
+            "fragment_size": str(fragment_size)
+        }
+
+        if inline_data is not None:
+            mapping["data"] = inline_data
+
+        self._redis.hset(f"file:{file_uuid}", mapping=mapping)
 
     def store_fragments(self, file_uuid: str, fragments: list) -> None:
         """
-        Save a list with the fragments' ids and their respective fragments.
+        Save a list with the fragments' ids and their respective fragments. The commands are
+        sent in pipelines of about `_BATCH_SIZE` bytes, so there is no round-trip per fragment
+        and the client never buffers a whole file. Inlined files are saved with
+        `store_metadata` instead.
 
         Args:
             file_uuid (str): File's unique identifier
             fragments (list[FileFragments]): List of FileFragments files objects
         """
-        self._redis.rpush(f"file:{file_uuid}:fragments", *[str(f.index) for f in fragments])
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.rpush(f"file:{file_uuid}:fragments", *[str(f.index) for f in fragments])
+        pending = 0
 
         for f in fragments:
-            self._redis.set(f"fragment:{file_uuid}:{f.index}", f.data)
+            pipe.set(f"fragment:{file_uuid}:{f.index}", f.data)
+            pending += len(f.data)
+
+            if pending >= self._BATCH_SIZE:
+                pipe.execute()
+                pending = 0
+
+        if len(pipe):
+            pipe.execute()
 
     def get_metadata(self, file_uuid: str) -> dict[str, str]:
         """
-        Load file metadata from Redis database.
+        Load file metadata from Redis database. Only the metadata fields are read, so the
+        data of inlined files is not transferred.
 
         Args:
             file_uuid (str): File's unique identifier
 
         Returns:
             dict: A dictionary with the file's metadata. The keys are the field names
-                  and the values are the field values.
+                  and the values are the field values. Missing fields are left out.
         """
-        data = self._redis.hgetall(f"file:{file_uuid}")
+        data = self._redis.hmget(f"file:{file_uuid}", self._METADATA_FIELDS)
 
-        if not data:
-            return {}
-
-        return {k.decode(): v.decode() for k,v in data.items()}
+        return {k: v.decode() for k,v in zip(self._METADATA_FIELDS, data, strict=True) if v is not None}
 
     def get_fragments(self, file_uuid: str) -> list[FileFragment]:
         """
-        Get the stored fragments files from Redis database.
+        Get the stored fragments files from Redis database. Inlined files are returned
+        as a single fragment read from the file metadata hash. Fragments are read with MGET
+        in batches of about `_BATCH_SIZE` bytes, since bigger replies are slower to
+        parse by the client (see tests/benchmarks/README.md).
 
         Args:
             file_uuid (str): File's unique identifier
@@ -102,12 +143,20 @@ class RedisService:
         Returns:
             list[FileFragments]: List of FileFragments files objects
         """
-        idxs = self._redis.lrange(f"file:{file_uuid}:fragments", 0, -1)
-        result = []
+        inline_data, fragment_size = self._redis.hmget(f"file:{file_uuid}", ("data", "fragment_size"))
+
+        if inline_data is not None:
+            return [FileFragment(index=0, data=inline_data, uuid=file_uuid)]
+
+        idxs = [int(binary_idx.decode()) for binary_idx in self._redis.lrange(f"file:{file_uuid}:fragments", 0, -1)]
+        keys = [f"fragment:{file_uuid}:{idx}" for idx in idxs]
+        batch = max(1, self._BATCH_SIZE // (int(fragment_size or 0) or self._LEGACY_FRAGMENT_SIZE))
+        frags_data = []
 
-        for binary_idx in idxs:
-            idx = int(binary_idx.decode())
-            frag_data = self._redis.get(f"fragment:{file_uuid}:{idx}")
-            result.append(FileFragment(index=idx, data=frag_data, uuid=file_uuid))
+        for i in range(0, len(keys), batch):
+            frags_data.extend(self._redis.mget(keys[i:i+batch]))
 
-        return result
+        return [
+            FileFragment(index=idx, data=frag_data, uuid=file_uuid)
+            for idx, frag_data in zip(idxs, frags_data, strict=True)
+        ]
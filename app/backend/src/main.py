@@ -72,7 +72,7 @@ async def upload_file(
 ) -> EncryptedResponse:
     """
     Upload a file, encrypt it, and store its metadata and fragments in Redis.
-    The file is fragmented into smaller chunks for storage.
+    The file is fragmented into smaller chunks for storage, or inlined into its metadata if it is small.
 
     Args:
         user_id (str): The user ID of the owner.
@@ -94,6 +94,8 @@ async def upload_file(
             user_id=encrypted.user_id,
             key=encrypted.key.decode(),
             created_at=encrypted.created_at,
+            fragment_size=encrypted.fragment_size,
+            inline_data=encrypted.fragments[0].data if encrypted.inline else None,
         )
 
         fragments_to_save = [
@@ -101,7 +103,8 @@ async def upload_file(
             for fragment in encrypted.fragments
         ]
 
-        redis.store_fragments(file_uuid=encrypted.uuid, fragments=fragments_to_save)
+        if not encrypted.inline:
+            redis.store_fragments(file_uuid=encrypted.uuid, fragments=fragments_to_save)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
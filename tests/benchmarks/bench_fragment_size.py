@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks used to choose the default FragmentPolicy tiers.
+
+For each encrypted token size, every candidate fragment size is measured: the number of
+Redis keys it creates, the time spent fragmenting and defragmenting the token, and the time
+spent storing and loading it in Redis. Storage is measured twice: with RedisService (inlined
+writes, or batched pipelines and MGETs) and with the previous path, which sent one
+command per fragment and read the metadata with HGETALL. Tokens up to 4MB are also measured
+inlined and as a single fragment key, to find where inlining stops paying off. The row marked
+with `*` is the one chosen by the default policy.
+
+Timings are the median of several rounds and half their interquartile range, in milliseconds.
+Each round measures every candidate of a token in turn, so drift on the host affects all of
+them alike. Keys are deleted between runs, outside the timing.
+
+Sizes refer to the encrypted token, since that is what the policy is applied to. Random bytes
+are used instead of real Fernet tokens, as only their size matters. Each token needs about 4x
+its size of memory (token, fragments, loaded copy and Redis). Results are recorded in the README.md
+file next to this script.
+
+Usage:
+
+>>> REDIS_URL=redis://localhost:6379 python -m tests.benchmarks.bench_fragment_size
+
+>>> # Only run the given token sizes (in bytes)
+>>> REDIS_URL=redis://localhost:6379 python -m tests.benchmarks.bench_fragment_size 262144 1073741824
+"""
+
+import gc
+import os
+import sys
+import time
+import uuid
+
+from cryptography.fernet import Fernet
+
+from app.backend.src.lib.crypto import Crypto
+from app.backend.src.lib.datatypes import FileFragment, FragmentPolicy
+from app.backend.src.lib.redis_service import RedisService
+
+_BYTES_PER_KB = 1024
+_BYTES_PER_MB = 1024 * _BYTES_PER_KB
+_BYTES_PER_GB = 1024 * _BYTES_PER_MB
+
+# Token sizes around the inline threshold and every tier, that fit in 5GB of memory.
+# Bigger tokens can be passed as arguments on bigger hosts.
+_TOKEN_SIZES = [
+    4 * _BYTES_PER_KB,
+    64 * _BYTES_PER_KB,
+    256 * _BYTES_PER_KB,
+    384 * _BYTES_PER_KB,
+    512 * _BYTES_PER_KB,
+    768 * _BYTES_PER_KB,
+    1 * _BYTES_PER_MB,
+    2 * _BYTES_PER_MB,
+    4 * _BYTES_PER_MB,
+    8 * _BYTES_PER_MB,
+    16 * _BYTES_PER_MB,
+    32 * _BYTES_PER_MB,
+    64 * _BYTES_PER_MB,
+    128 * _BYTES_PER_MB,
+    256 * _BYTES_PER_MB,
+    512 * _BYTES_PER_MB,
+    1 * _BYTES_PER_GB,
+]
+_FRAGMENT_SIZES = [
+    256 * _BYTES_PER_KB,
+    1 * _BYTES_PER_MB,
+    4 * _BYTES_PER_MB,
+    8 * _BYTES_PER_MB,
+    16 * _BYTES_PER_MB,
+    32 * _BYTES_PER_MB,
+]
+
+# Timings reported for each candidate, in column order
+_MEASURES = ("split", "join", "store", "load", "legacy store", "legacy load")
+
+# Tokens up to this size are also measured inlined, even if the policy does not inline them
+_MAX_INLINE_CANDIDATE = 4 * _BYTES_PER_MB
+
+def _rounds(token_size: int) -> int:
+    """
+    Number of rounds for a token size.
+    """
+    if token_size >= 256 * _BYTES_PER_MB:
+        return 11
+
+    return 31 if token_size >= _BYTES_PER_MB else 301
+
+def _timed(func, setup=None) -> tuple[float, object]:
+    """
+    Run a function once and return the time it took, in milliseconds, and its result.
+    The setup function runs before it, outside the timing.
+    """
+    if setup is not None:
+        setup()
+
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+
+    return (time.perf_counter() - start) * 1000, result
+
+def _summary(timings: list[float]) -> tuple[float, float]:
+    """
+    Return the median of several timings and half their interquartile range.
+    """
+    timings = sorted(timings)
+    spread = (timings[(3 * len(timings)) // 4] - timings[len(timings) // 4]) / 2
+
+    return timings[len(timings) // 2], spread
+
+def _legacy_store(redis: RedisService, file_uuid: str, fragments: list[FileFragment]) -> None:
+    """
+    Store fragments the way RedisService did before pipelining: one round-trip per fragment.
+    """
+    redis._redis.rpush(f"file:{file_uuid}:fragments", *[str(f.index) for f in fragments])
+
+    for f in fragments:
+        redis._redis.set(f"fragment:{file_uuid}:{f.index}", f.data)
+
+def _legacy_load(redis: RedisService, file_uuid: str) -> list[FileFragment]:
+    """
+    Load a file the way RedisService did before: HGETALL, then one round-trip per fragment.
+    """
+    redis._redis.hgetall(f"file:{file_uuid}")
+    idxs = redis._redis.lrange(f"file:{file_uuid}:fragments", 0, -1)
+    result = []
+
+    for binary_idx in idxs:
+        idx = int(binary_idx.decode())
+        frag_data = redis._redis.get(f"fragment:{file_uuid}:{idx}")
+        result.append(FileFragment(index=idx, data=frag_data, uuid=file_uuid))
+
+    return result
+
+def _bench_token(redis: RedisService, crypto: Crypto, token_size: int, candidates: list[tuple[int, bool]],
+                 rounds: int) -> dict[tuple[int, bool], dict[str, list[float]]]:
+    """
+    Measure every candidate (fragment size, inline) pair for a token size. Candidates are
+    measured in turn within each round, so drift on the host affects all of them alike.
+    Keys are deleted before each store, outside the timing.
+    """
+    token = os.urandom(token_size)
+    file_uuid = str(uuid.uuid4())
+    timings = {c: {m: [] for m in _MEASURES} for c in candidates}
+
+    def clean(fragments):
+        redis._redis.delete(f"file:{file_uuid}", f"file:{file_uuid}:fragments")
+        redis._redis.delete(*[f"fragment:{file_uuid}:{f.index}" for f in fragments])
+
+    def store(fragments, fragment_size, inline, legacy):
+        if legacy:
+            redis.store_metadata(file_uuid, "bench", "key", "0", fragment_size)
+            _legacy_store(redis, file_uuid, fragments)
+        elif inline:
+            redis.store_metadata(file_uuid, "bench", "key", "0", fragment_size, fragments[0].data)
+        else:
+            redis.store_metadata(file_uuid, "bench", "key", "0", fragment_size)
+            redis.store_fragments(file_uuid, fragments)
+
+    def load(legacy):
+        if legacy:
+            _legacy_load(redis, file_uuid)
+        else:
+            redis.get_metadata(file_uuid)
+            redis.get_fragments(file_uuid)
+
+    for _ in range(rounds):
+        for fragment_size, inline in candidates:
+            measures = timings[(fragment_size, inline)]
+            split_ms, fragments = _timed(lambda fs=fragment_size: crypto._fragment_bytes(token, fs))
+            measures["split"].append(split_ms)
+            measures["join"].append(_timed(lambda frags=fragments: crypto._defragment_bytes(frags))[0])
+
+            for legacy, prefix in ((False, ""), (True, "legacy ")):
+                measures[f"{prefix}store"].append(_timed(
+                    lambda frags=fragments, fs=fragment_size, inl=inline, lg=legacy: store(frags, fs, inl, lg),
+                    setup=lambda frags=fragments: clean(frags),
+                )[0])
+                measures[f"{prefix}load"].append(_timed(lambda lg=legacy: load(lg))[0])
+
+            clean(fragments)
+            del fragments
+
+    return timings
+
+def _format_size(size: int) -> str:
+    """
+    Format a size in bytes using the biggest unit below it.
+    """
+    for unit, factor in (("GB", _BYTES_PER_GB), ("MB", _BYTES_PER_MB), ("KB", _BYTES_PER_KB)):
+        if size >= factor:
+            rest = size % factor
+            return f"{size // factor}{unit}" + (f"+{rest}" if rest else "")
+
+    return f"{size}B"
+
+def _format_timings(timings: list[float]) -> str:
+    """
+    Format several timings in milliseconds as their median and half their interquartile range.
+    """
+    median, spread = _summary(timings)
+    return f"{median:.2f} ±{spread:.2f}"
+
+def _candidates(crypto: Crypto, token_size: int) -> list[tuple[int, bool]]:
+    """
+    Build the (fragment size, inline) pairs measured for a token size.
+    """
+    candidates = {
+        (fs, False) for fs in _FRAGMENT_SIZES
+        if fs < token_size and token_size // fs <= 4096
+    }
+    candidates.add((crypto._select_fragment_size(token_size), crypto._is_inline(token_size)))
+
+    if token_size <= _MAX_INLINE_CANDIDATE:
+        candidates.update({(token_size, True), (token_size, False)})
+
+    return sorted(candidates)
+
+def main() -> None:
+    redis_url = os.getenv("REDIS_URL")
+
+    if not redis_url:
+        raise SystemExit("REDIS_URL not set")
+
+    redis = RedisService(url=redis_url)
+    crypto = Crypto(Fernet.generate_key(), FragmentPolicy())
+    token_sizes = [int(arg) for arg in sys.argv[1:]] or _TOKEN_SIZES
+
+    print(
+        "| token | fragment | inline | keys | split ms | join ms "
+        "| store ms | load ms | legacy store ms | legacy load ms |"
+    )
+    print("|---:|---:|:---:|---:|---:|---:|---:|---:|---:|---:|")
+
+    for token_size in token_sizes:
+        chosen = (crypto._select_fragment_size(token_size), crypto._is_inline(token_size))
+        candidates = _candidates(crypto, token_size)
+        timings = _bench_token(redis, crypto, token_size, candidates, _rounds(token_size))
+
+        for fragment_size, inline in candidates:
+            keys = 1 if inline else -(-token_size // fragment_size) + 2
+            mark = "*" if (fragment_size, inline) == chosen else ""
+            print(
+                f"| {_format_size(token_size)} | {_format_size(fragment_size)}{mark} | {'yes' if inline else 'no'} "
+                f"| {keys} | "
+                + " | ".join(_format_timings(timings[(fragment_size, inline)][m]) for m in _MEASURES)
+                + " |",
+                flush=True,
+            )
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import pytest
 from cryptography.fernet import Fernet, InvalidToken
 
 from app.backend.src.lib.crypto import Crypto
-from app.backend.src.lib.datatypes import EncryptedFile, FileFragment
+from app.backend.src.lib.datatypes import EncryptedFile, FileFragment, FragmentPolicy, FragmentTier
 
 _BYTES_PER_MB = 1024 * 1024
 
@@ -26,7 +26,8 @@ def key():
 
 @pytest.fixture
 def crypto(key):
-    return Crypto(key)
+    # Crypto is a singleton, so the default policy is passed to undo any custom one
+    return Crypto(key, FragmentPolicy())
 
 @pytest.fixture
 def user_id():
@@ -89,14 +90,16 @@ def test_fragment_file_datatype_is_valid(fragments):
         assert isinstance(f.index, int)
         assert 0 <= f.index < len(fragments)
 
-def test_fragments_has_correct_size(fragments, crypto):
+def test_fragments_has_correct_size(fragments, crypto, token):
     """
     Verify that all fragments are sized correctly, with only the last one potentially smaller.
     """
+    fragment_size = crypto._select_fragment_size(len(token))
+
     for f in fragments[:-1]:
-        assert len(f.data) == crypto._FRAGMENT_SIZE
+        assert len(f.data) == fragment_size
 
-    assert len(fragments[-1].data) <= crypto._FRAGMENT_SIZE
+    assert len(fragments[-1].data) <= fragment_size
 
 def test_encrypt_then_decrypt_restores_original_data(crypto, data, user_id, key):
     """
@@ -172,3 +175,118 @@ def test_decryption_fails_on_modified_fragment(crypto, user_id, data, key):
 
     with pytest.raises(InvalidToken):
         crypto.decrypt(fragments, key)
+
+def test_encrypted_file_records_fragment_size(crypto, data, user_id, key):
+    """
+    Ensure that the fragment size chosen for a file is recorded in the EncryptedFile.
+    """
+    encrypted_file = crypto.encrypt(data, user_id, key)
+
+    assert encrypted_file.fragment_size > 0
+    assert not encrypted_file.inline
+
+    for f in encrypted_file.fragments:
+        assert len(f.data) <= encrypted_file.fragment_size
+
+@pytest.mark.parametrize("data", [0.004], indirect=True)
+def test_small_file_is_inlined(crypto, user_id, data, key):
+    """
+    Check that files below the inline threshold are kept as a single inlined fragment.
+    """
+    encrypted_file = crypto.encrypt(data, user_id, key)
+
+    assert encrypted_file.inline
+    assert len(encrypted_file.fragments) == 1
+    assert crypto.decrypt(encrypted_file.fragments, key) == data
+
+@pytest.mark.parametrize(("token_size", "inline"), [
+    (FragmentPolicy().inline_threshold, True),
+    (FragmentPolicy().inline_threshold + 1, False),
+])
+def test_inline_threshold_is_inclusive(crypto, token_size, inline):
+    """
+    Verify that tokens of exactly the inline threshold are inlined, and bigger ones are not.
+    """
+    assert crypto._is_inline(token_size) is inline
+
+@pytest.mark.parametrize(("token_size", "fragment_size"), [
+    (FragmentPolicy().inline_threshold, FragmentPolicy().inline_threshold),
+    (FragmentPolicy().inline_threshold + 1, 256 * 1024),
+    (_BYTES_PER_MB, 256 * 1024),
+    (_BYTES_PER_MB + 1, _BYTES_PER_MB),
+    (512 * _BYTES_PER_MB, _BYTES_PER_MB),
+    (512 * _BYTES_PER_MB + 1, 4 * _BYTES_PER_MB),
+    (16 * 1024 * _BYTES_PER_MB, 4 * _BYTES_PER_MB),
+    (16 * 1024 * _BYTES_PER_MB + 1, 4 * _BYTES_PER_MB),
+])
+def test_fragment_size_grows_with_token_size(crypto, token_size, fragment_size):
+    """
+    Verify that tokens use the fragment size of their tier at both edges, and the last tier beyond it.
+    """
+    assert crypto._select_fragment_size(token_size) == fragment_size
+
+def test_custom_policy_is_used(key, user_id):
+    """
+    Ensure that custom tiers are honoured when fragmenting a file.
+    """
+    policy = FragmentPolicy(
+        inline_threshold=0,
+        tiers=(FragmentTier(max_token_size=_BYTES_PER_MB, fragment_size=1024),),
+        max_fragment_size=1024,
+    )
+    crypto = Crypto(key, policy)
+    data = os.urandom(4096)
+
+    encrypted_file = crypto.encrypt(data, user_id, key)
+
+    assert encrypted_file.fragment_size == 1024
+    assert not encrypted_file.inline
+    assert len(encrypted_file.fragments) > 1
+    assert crypto.decrypt(encrypted_file.fragments, key) == data
+
+def test_custom_policy_survives_singleton_reinit(key):
+    """
+    Check that creating the Crypto singleton again without a policy keeps the custom one.
+    """
+    policy = FragmentPolicy(inline_threshold=1024)
+    Crypto(key, policy)
+
+    assert Crypto(key)._policy is policy
+
+def test_policy_tiers_are_sorted():
+    """
+    Verify that the policy tiers are sorted by their maximum token size.
+    """
+    small = FragmentTier(max_token_size=_BYTES_PER_MB, fragment_size=1024)
+    big = FragmentTier(max_token_size=2 * _BYTES_PER_MB, fragment_size=2048)
+
+    assert FragmentPolicy(tiers=(big, small)).tiers == (small, big)
+
+@pytest.mark.parametrize(("max_token_size", "fragment_size"), [
+    (0, 1024),
+    (_BYTES_PER_MB, 0),
+    (_BYTES_PER_MB, -1),
+])
+def test_invalid_tier_is_rejected(max_token_size, fragment_size):
+    """
+    Ensure that tiers with non-positive sizes are rejected.
+    """
+    with pytest.raises(ValueError):
+        FragmentTier(max_token_size=max_token_size, fragment_size=fragment_size)
+
+@pytest.mark.parametrize("kwargs", [
+    {"tiers": ()},
+    {"inline_threshold": -1},
+    {"max_fragment_size": 0},
+    {"inline_threshold": 2048, "max_fragment_size": 1024,
+     "tiers": (FragmentTier(max_token_size=_BYTES_PER_MB, fragment_size=1024),)},
+    {"max_fragment_size": 1024, "inline_threshold": 0,
+     "tiers": (FragmentTier(max_token_size=_BYTES_PER_MB, fragment_size=4096),)},
+])
+def test_invalid_policy_is_rejected(kwargs):
+    """
+    Ensure that policies without tiers, with invalid sizes or with fragments bigger
+    than the backend limit are rejected.
+    """
+    with pytest.raises(ValueError):
+        FragmentPolicy(**kwargs)
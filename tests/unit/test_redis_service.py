@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+
+"""
+Suite of tests functions for the RedisService class.
+"""
+
+import os
+
+import pytest
+
+from app.backend.src.lib.datatypes import FileFragment
+from app.backend.src.lib.redis_service import RedisService
+
+_BYTES_PER_MB = 1024 * 1024
+
+# ----------------------
+# Fakes
+# ----------------------
+
+def _to_bytes(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+class _FakePipeline:
+    """
+    In-memory pipeline: queued commands run against the fake client on execute().
+    """
+    def __init__(self, client):
+        self._client = client
+        self._queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._queued.append((name, args, kwargs))
+        return queue
+
+    def __len__(self):
+        return len(self._queued)
+
+    def execute(self):
+        queued, self._queued = self._queued, []
+        self._client.commands.append("EXECUTE")
+        self._client.pipelined.extend(name.upper() for name, _, _ in queued)
+        return [getattr(self._client, f"_{name}")(*args, **kwargs) for name, args, kwargs in queued]
+
+class _FakeRedis:
+    """
+    In-memory Redis client. Every direct call is a round-trip and is logged in `commands`,
+    while commands sent through a pipeline are logged in `pipelined`.
+    """
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.pipelined = []
+
+    def __getattr__(self, name):
+        command = getattr(self, f"_{name}")
+
+        def call(*args, **kwargs):
+            self.commands.append(name.upper())
+            return command(*args, **kwargs)
+        return call
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def _hset(self, name, key=None, value=None, mapping=None):
+        fields = self.data.setdefault(name, {})
+        fields.update({_to_bytes(k): _to_bytes(v) for k, v in (mapping or {key: value}).items()})
+
+    def _hmget(self, name, keys):
+        fields = self.data.get(name, {})
+        return [fields.get(_to_bytes(k)) for k in keys]
+
+    def _rpush(self, name, *values):
+        self.data.setdefault(name, []).extend(_to_bytes(v) for v in values)
+
+    def _lrange(self, name, start, end):
+        return list(self.data.get(name, []))
+
+    def _set(self, name, value):
+        self.data[name] = _to_bytes(value)
+
+    def _mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+# ----------------------
+# Fixtures
+# ----------------------
+
+@pytest.fixture
+def fake_redis():
+    return _FakeRedis()
+
+@pytest.fixture
+def redis_service(fake_redis):
+    service = RedisService(url="redis://localhost:6379")
+    service._redis = fake_redis
+    return service
+
+@pytest.fixture
+def file_uuid():
+    return "file_uuid"
+
+@pytest.fixture
+def fragments(file_uuid):
+    return [FileFragment(uuid=file_uuid, data=os.urandom(64), index=idx) for idx in range(5)]
+
+def _store(redis_service, file_uuid, fragments, fragment_size, inline=False):
+    inline_data = fragments[0].data if inline else None
+    redis_service.store_metadata(file_uuid, "user_id", "key", "0", fragment_size, inline_data)
+
+    if not inline:
+        redis_service.store_fragments(file_uuid, fragments)
+
+# ----------------------
+# Tests
+# ----------------------
+
+def test_metadata_records_fragment_size(redis_service, file_uuid):
+    """
+    Ensure that the stored metadata includes the chosen fragment size.
+    """
+    redis_service.store_metadata(file_uuid, "user_id", "key", "0", _BYTES_PER_MB)
+
+    assert redis_service.get_metadata(file_uuid) == {
+        "user_id": "user_id",
+        "key": "key",
+        "created_at": "0",
+        "fragment_size": str(_BYTES_PER_MB),
+    }
+
+def test_metadata_of_missing_file_is_empty(redis_service):
+    """
+    Check that loading the metadata of an unknown file returns an empty dictionary.
+    """
+    assert redis_service.get_metadata("missing") == {}
+
+def test_metadata_does_not_read_inlined_data(redis_service, fake_redis, file_uuid, fragments):
+    """
+    Verify that the metadata is read with a single HMGET that leaves the inlined data out.
+    """
+    _store(redis_service, file_uuid, fragments[:1], 64, inline=True)
+    fake_redis.commands.clear()
+
+    metadata = redis_service.get_metadata(file_uuid)
+
+    assert fake_redis.commands == ["HMGET"]
+    assert "data" not in metadata
+
+def test_inline_file_round_trips_in_metadata_hash(redis_service, fake_redis, file_uuid, fragments):
+    """
+    Ensure that inlined files are stored along with their metadata in a single HSET,
+    and loaded from the metadata hash only.
+    """
+    _store(redis_service, file_uuid, fragments[:1], 64, inline=True)
+
+    assert fake_redis.commands == ["HSET"]
+    assert set(fake_redis.data) == {f"file:{file_uuid}"}
+
+    fake_redis.commands.clear()
+    loaded = redis_service.get_fragments(file_uuid)
+
+    assert fake_redis.commands == ["HMGET"]
+    assert loaded == [FileFragment(uuid=file_uuid, data=fragments[0].data, index=0)]
+
+@pytest.mark.parametrize(("batch_size", "executes"), [
+    (1024, 1),
+    (128, 3),
+    (64, 5),
+])
+def test_fragments_are_stored_in_pipeline_batches(redis_service, fake_redis, monkeypatch, file_uuid, fragments,
+                                                  batch_size, executes):
+    """
+    Verify that fragments are written with one pipeline per batch of `_BATCH_SIZE` bytes.
+    """
+    monkeypatch.setattr(RedisService, "_BATCH_SIZE", batch_size)
+    redis_service.store_fragments(file_uuid, fragments)
+
+    assert fake_redis.commands == ["EXECUTE"] * executes
+    assert fake_redis.pipelined == ["RPUSH"] + ["SET"] * len(fragments)
+    assert redis_service.get_fragments(file_uuid) == fragments
+
+def test_fragments_round_trip_in_order(redis_service, file_uuid, fragments):
+    """
+    Ensure that stored fragments are loaded back with their indices and data.
+    """
+    _store(redis_service, file_uuid, fragments, 64)
+
+    assert redis_service.get_fragments(file_uuid) == fragments
+
+@pytest.mark.parametrize(("fragment_size", "mgets"), [
+    (64, 1),
+    (1 * _BYTES_PER_MB, 2),
+    (4 * _BYTES_PER_MB, 5),
+    (16 * _BYTES_PER_MB, 5),
+])
+def test_fragments_are_loaded_in_mget_batches(redis_service, fake_redis, file_uuid, fragments, fragment_size, mgets):
+    """
+    Check that fragments are loaded with one MGET per batch of `_BATCH_SIZE` bytes.
+    """
+    _store(redis_service, file_uuid, fragments, fragment_size)
+    fake_redis.commands.clear()
+
+    loaded = redis_service.get_fragments(file_uuid)
+
+    assert fake_redis.commands == ["HMGET", "LRANGE"] + ["MGET"] * mgets
+    assert loaded == fragments
+
+def test_fragments_without_fragment_size_use_legacy_batches(redis_service, fake_redis, file_uuid, fragments):
+    """
+    Verify that files stored before the fragment size was recorded can still be loaded.
+    """
+    fake_redis.data[f"file:{file_uuid}"] = {b"user_id": b"user_id", b"key": b"key", b"created_at": b"0"}
+    redis_service.store_fragments(file_uuid, fragments)
+    fake_redis.commands.clear()
+
+    assert redis_service.get_fragments(file_uuid) == fragments
+    assert fake_redis.commands == ["HMGET", "LRANGE", "MGET", "MGET"]
+
+def test_fragments_of_missing_file_are_empty(redis_service, fake_redis):
+    """
+    Check that loading the fragments of an unknown file returns an empty list without any MGET.
+    """
+    assert redis_service.get_fragments("missing") == []
+    assert fake_redis.commands == ["HMGET", "LRANGE"]